@@ -1,4 +1,4 @@
-import os, datetime, time, shutil, csv
+import os, datetime, time, shutil, csv, getpass
 from types import SimpleNamespace
 from rich.console import Console
 from config import *
@@ -12,12 +12,19 @@ console = Console(highlight=False)
 # Định nghĩa múi giờ GMT+7 dùng chung cho toàn hệ thống
 VN_TZ = datetime.timezone(datetime.timedelta(hours=7))
 
+# Tên người dùng không đổi trong suốt phiên -> tra một lần (getuser quét biến môi trường/pwd)
+try: _CURRENT_USER = getpass.getuser()
+except Exception: _CURRENT_USER = "unknown_user"
+
 def _get_now():
     return datetime.datetime.now(VN_TZ)
 
 def _clear_screen(): 
-    if _CONFIG.CLEAR_SCREEN:
-        os.system("cls" if os.name == "nt" else "clear")
+    # Khi output bị chuyển hướng (không phải TTY) thì không cần gọi lệnh xoá màn hình.
+    # Gửi mã điều khiển qua console thay vì os.system("cls"/"clear") -> không tạo tiến trình shell mỗi lần vẽ lại,
+    # và được gom chung vào bộ đệm khi nằm trong khối `with console:`
+    if _CONFIG.CLEAR_SCREEN and console.is_terminal:
+        console.clear()
 
 def _handle_error(msg, delay=None):
     console.print(msg, style=_CONFIG.COLOR_ERROR)
@@ -40,7 +47,7 @@ def _safe_input(prompt, validator=None, allow_exit=True):
     while True:
         try: v = console.input(prompt).strip()
         except (KeyboardInterrupt, EOFError): return None
-        if allow_exit and v.lower() in ["exit", "/exit"]: return None
+        if allow_exit and v.lower() in {"exit", "/exit"}: return None
         if validator:
             ok, val = validator(v)
             if ok: return val
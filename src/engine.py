@@ -1,12 +1,72 @@
-import random, string, re, csv, os, getpass, difflib
+import random, string, re, csv, os, unicodedata, heapq, bisect
 from rich.table import Table
 from rich.text import Text
 from rich import box
-from src.core import _CONFIG, console
+from src.core import _CONFIG, console, _CURRENT_USER
 from src.utils import _replace_colors, _clear_screen, _handle_error, _get_now, _safe_input
 from src.process_log import log_action, log_difficulty
 import src.process_input as inp
 
+def _fold(text):
+    """Chuẩn hoá Unicode (NFC) + chữ thường để so khớp từ khóa tiếng Việt ổn định."""
+    return unicodedata.normalize("NFC", str(text)).lower()
+
+def _trie_pattern(node):
+    """Sinh regex từ trie: các từ khóa chung tiền tố dùng chung nhánh, nhánh dài được thử trước."""
+    alts = [re.escape(ch) + _trie_pattern(sub) for ch, sub in sorted(node.items()) if ch]
+    if not alts: return ""
+    body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+    return f"(?:{body})?" if "" in node else body
+
+def _compile_kws(kws):
+    """Biên dịch danh sách từ khóa thành một regex duy nhất (ưu tiên cụm dài nhất)."""
+    trie = {}
+    for kw in kws:
+        if not kw: continue
+        node = trie
+        for ch in kw: node = node.setdefault(ch, {})
+        node[""] = {} # Đánh dấu kết thúc một từ khóa
+    return re.compile(_trie_pattern(trie)) if trie else None
+
+# Regex nhận diện dạng câu hỏi [Đúng/Sai] và dạng viết tắt, biên dịch một lần khi import
+_TF_RE = _compile_kws(map(_fold, getattr(_CONFIG, 'KEYWORD_BOOL', ())))
+_Q_INPUT_RE = _compile_kws(map(_fold, getattr(_CONFIG, 'KEYWORD_Q_INPUT', ())))
+
+# Regex làm sạch văn bản dùng ở mỗi lần chấm đáp án / sinh phương án: biên dịch sẵn một lần
+_MARKUP_RE = re.compile(r'\[/?[a-zA-Z #0-9,._-]*\]')
+_PAREN_RE = re.compile(r'\(.*?\)')
+_WORD_RE = re.compile(r'\b[a-zA-Z]{2,}\b')
+_SEP_RE = re.compile(r'[\s\-_]+')
+
+# Nhãn phản hồi tĩnh: parse markup một lần, mỗi lần dùng chỉ .copy() rồi nối thêm nội dung
+_OK_BANNER = Text.from_markup("\n[bold white on green] ✨ CHÍNH XÁC! [/] ")
+_FAIL_BANNER = Text.from_markup("\n[bold white on red] 🌪️ TIẾC QUÁ... [/] Đáp án đúng: ")
+
+def _build_difficulty_table():
+    """Dựng bảng chọn mức độ (không phụ thuộc dữ liệu nên chỉ cần dựng một lần)."""
+    table = Table(title="⚡ CHỌN MỨC ĐỘ THỬ THÁCH", box=box.SIMPLE)
+    table.add_column("Key", style="bold cyan", justify="right"); table.add_column("Chế độ", style="white")
+    modes = [
+        ("1", "[green]Dễ (10 câu, 3 đáp án)[/]"),
+        ("2", "[yellow]Vừa (20 câu, 4 đáp án)[/]"),
+        ("3", "[red]Khó (50 câu, 6 đáp án)[/]"),
+        ("4", "[magenta]Hardcore (100 câu, 10 đáp án)[/]"),
+        ("5", "Sinh tồn (Sai là dừng, 4 đáp án)"),
+        ("6", "Tùy chỉnh (Tự thiết lập)")
+    ]
+    for k, v in modes: table.add_row(k, v)
+    return table
+
+_DIFFICULTY_TABLE = _build_difficulty_table()
+# Mức độ -> (số đáp án, số câu tối đa, chế độ sinh tồn); mục 6 (tùy chỉnh) hỏi thêm người dùng
+_DIFFICULTY_PRESETS = {
+    1: (3, 10, False),
+    2: (4, 20, False),
+    3: (6, 50, False),
+    4: (10, 100, False),
+    5: (4, 999, True), # Chế độ sinh tồn
+}
+
 class QuizGame:
     def __init__(self): pass
 
@@ -18,10 +78,29 @@ class QuizGame:
         if os.path.exists(f_path):
             try:
                 with open(f_path, "r", encoding="utf-8") as f:
-                    self._cached_kws = [l.strip().lower() for l in f if l.strip() and not l.startswith("#")]
+                    # Chuẩn hoá khoảng trắng/chữ thường và loại trùng (giữ nguyên thứ tự) ngay khi nạp
+                    kws = (_fold(" ".join(l.split())) for l in f if l.strip() and not l.startswith("#"))
+                    self._cached_kws = list(dict.fromkeys(kws))
             except: pass
         return self._cached_kws
 
+    def _match_kw(self, text):
+        """Trả về từ khóa bộ lọc xuất hiện trong câu hỏi (hoặc None) bằng một lượt quét regex."""
+        if not hasattr(self, '_kw_re'): self._kw_re, self._kw_memo = _compile_kws(self._get_kws()), {}
+        # Cùng một câu hỏi được phân loại nhiều lần (run, _get_options) -> ghi nhớ kết quả theo nội dung
+        text = str(text)
+        if text not in self._kw_memo:
+            m = self._kw_re.search(self._fold_q(text)) if self._kw_re else None
+            self._kw_memo[text] = m.group() if m else None
+        return self._kw_memo[text]
+
+    def _fold_q(self, text):
+        """Dạng chuẩn hoá (_fold) của câu hỏi, tính một lần cho mỗi câu trong cả lượt chơi."""
+        if not hasattr(self, '_cached_q_fold'): self._cached_q_fold = {}
+        text = str(text)
+        if text not in self._cached_q_fold: self._cached_q_fold[text] = _fold(text)
+        return self._cached_q_fold[text]
+
     def _get_word_bank(self, all_ans):
         """Tạo ngân hàng từ vựng phân loại theo chữ cái đầu từ toàn bộ bộ đề."""
         if hasattr(self, '_cached_bank'): return self._cached_bank
@@ -30,7 +109,7 @@ class QuizGame:
             # Lấy text từ cả Answer, Question, Hint và Desc để làm phong phú từ vựng
             text = self._clean_text(f"{row[1]} {row[2]} {row[3] or ''} {row[4] or ''}")
             # Tìm các từ có độ dài >= 2 (bỏ qua các từ đơn lẻ không nghĩa)
-            words = re.findall(r'\b[a-zA-Z]{2,}\b', text)
+            words = _WORD_RE.findall(text)
             for w in words:
                 first = w[0].upper()
                 if first not in bank: bank[first] = set()
@@ -38,6 +117,57 @@ class QuizGame:
         self._cached_bank = {k: list(v) for k, v in bank.items()}
         return self._cached_bank
 
+    def _get_answer_index(self, all_ans):
+        """Chuẩn hoá + loại trùng đáp án (strip + lower) một lần cho cả lượt chơi thay vì ở mỗi câu hỏi."""
+        if hasattr(self, '_cached_ans_index'): return self._cached_ans_index
+        uniq = dict.fromkeys(str(x[1]).strip() for x in all_ans)
+        self._cached_ans_index = tuple((ans, ans.lower()) for ans in uniq)
+        return self._cached_ans_index
+
+    def _get_len_index(self, all_ans):
+        """Đáp án (trừ nhãn Đúng/Sai) sắp theo độ dài, trộn trước một lần để các câu cùng độ dài có thứ tự ngẫu nhiên mỗi lượt chơi."""
+        if hasattr(self, '_cached_len_index'): return self._cached_len_index
+        entries = [e for e in self._get_answer_index(all_ans) if e[0] not in {"Đúng", "Sai"}]
+        random.shuffle(entries)
+        entries.sort(key=lambda e: len(e[0]))
+        self._cached_len_index = (entries, [len(e[0]) for e in entries])
+        return self._cached_len_index
+
+    def _nearest_by_len(self, all_ans, target_len, a_clean, k):
+        """Lấy k đáp án có độ dài gần target_len nhất bằng bisect + mở rộng hai phía (O(log N + k) thay vì quét cả bộ đề)."""
+        entries, lens = self._get_len_index(all_ans)
+        lo = hi = bisect.bisect_left(lens, target_len)
+        out, n = [], len(entries)
+        while len(out) < k and (lo > 0 or hi < n):
+            if hi < n and (lo == 0 or lens[hi] - target_len <= target_len - lens[lo - 1]):
+                ans, ans_low = entries[hi]; hi += 1
+            else:
+                lo -= 1; ans, ans_low = entries[lo]
+            if ans_low != a_clean: out.append(ans)
+        return out
+
+    def _get_initials_index(self, all_ans):
+        """Nhóm đáp án theo chữ cái đầu một lần cho cả lượt chơi, dùng cho câu hỏi viết tắt."""
+        if hasattr(self, '_cached_initials_index'): return self._cached_initials_index
+        index = {}
+        for ans, ans_low in self._get_answer_index(all_ans):
+            index.setdefault(self._get_initials(ans), []).append((ans, ans_low))
+        self._cached_initials_index = index
+        return index
+
+    def _get_kw_groups(self, data):
+        """Nhóm đáp án theo từ khóa bộ lọc một lần cho cả lượt chơi để không quét lại data ở mỗi câu hỏi."""
+        if hasattr(self, '_cached_kw_groups'): return self._cached_kw_groups
+        kws = self._get_kws()
+        groups = {k: [] for k in kws}
+        for x in data:
+            q_low, ans = self._fold_q(x[2]), str(x[1]).strip()
+            for k in kws:
+                if k in q_low: groups[k].append((ans, ans.lower()))
+        # Đóng băng thành tuple: nhóm cố định suốt lượt chơi, chỉ được đọc ở mỗi câu hỏi
+        self._cached_kw_groups = groups = {k: tuple(v) for k, v in groups.items()}
+        return groups
+
     def _get_history_word_bank(self):
         """Quét lịch sử các lần làm sai để lấy từ vựng ưu tiên làm phương án nhiễu."""
         if hasattr(self, '_cached_history_bank'): return self._cached_history_bank
@@ -56,7 +186,7 @@ class QuizGame:
                     for row in reader[7:]:
                         if len(row) >= 4 and row[3].strip().lower() == "false":
                             text = self._clean_text(row[2]) # Cột 'correct'
-                            words = re.findall(r'\b[a-zA-Z]{2,}\b', text)
+                            words = _WORD_RE.findall(text)
                             for w in words:
                                 first = w[0].upper()
                                 if first not in bank: bank[first] = set()
@@ -68,8 +198,8 @@ class QuizGame:
     def _generate_fake_phrase(self, original_a, bank, h_bank=None):
         """Sinh cụm từ giả thông minh hơn bằng cách khớp độ dài từ gốc."""
         # Làm sạch và tách các từ gốc
-        clean_a = re.sub(r'\(.*?\)', '', self._clean_text(original_a)).strip()
-        words = [w for w in re.split(r'[\s\-_]+', clean_a) if w]
+        clean_a = _PAREN_RE.sub('', self._clean_text(original_a)).strip()
+        words = [w for w in _SEP_RE.split(clean_a) if w]
         if not words: return None
         
         # Nếu answer chỉ là 1 từ duy nhất và dài hơn 1 ký tự (VD: 'IMAP')
@@ -111,8 +241,8 @@ class QuizGame:
     def _get_initials(self, text):
         """Lấy các chữ cái đầu. VD: 'Access Control List' -> 'ACL', 'ACL' -> 'ACL'."""
         # Loại bỏ nội dung trong ngoặc đơn nếu có: "Access Control List (ACL)" -> "Access Control List"
-        clean = re.sub(r'\(.*?\)', '', self._clean_text(text)).strip()
-        words = [w for w in re.split(r'[\s\-_]+', clean) if w]
+        clean = _PAREN_RE.sub('', self._clean_text(text)).strip()
+        words = [w for w in _SEP_RE.split(clean) if w]
         if not words: return ""
         
         # Nếu có nhiều từ, lấy các chữ cái đầu
@@ -124,13 +254,18 @@ class QuizGame:
     def _clean_text(self, text):
         """Loại bỏ Rich Markup [style]...[/style] để so sánh đáp án."""
         # Thay đổi dấu + thành * để nhận diện và loại bỏ cả thẻ đóng [/] của Rich
-        clean = re.sub(r'\[/?[a-zA-Z #0-9,._-]*\]', '', str(text))
+        clean = _MARKUP_RE.sub('', str(text))
         return clean.strip().lower().rstrip('.')
 
     def _check_correctness(self, user_input, correct_answer):
         """So sánh đáp án có hỗ trợ Fuzzy Matching."""
+        # Phương án trắc nghiệm là đáp án đã qua _replace_colors (có cache) -> chọn đúng phương án đó thì khỏi làm sạch
+        if user_input == _replace_colors(correct_answer): return True, 1.0
         u_clean = self._clean_text(user_input)
-        c_clean = self._clean_text(correct_answer)
+        # Đáp án chuẩn được làm sạch một lần rồi giữ lại (câu hỏi có thể được chấm lại nhiều lần)
+        if not hasattr(self, '_cached_clean_ans'): self._cached_clean_ans = {}
+        c_clean = self._cached_clean_ans.get(correct_answer)
+        if c_clean is None: c_clean = self._cached_clean_ans[correct_answer] = self._clean_text(correct_answer)
 
         # 1. Kiểm tra khớp chính xác sau khi làm sạch
         if u_clean == c_clean:
@@ -167,23 +302,24 @@ class QuizGame:
         return False, 0.0
 
     def _get_options(self, qid, q, a, data, all_ans, n_opts):
-        tf_kws = getattr(_CONFIG, 'KEYWORD_BOOL', [])
-        if any(kw.lower() in q.lower() for kw in tf_kws): return ["Đúng", "Sai"]
+        q_low = self._fold_q(q)
+        if _TF_RE and _TF_RE.search(q_low): return ["Đúng", "Sai"]
         
         # Thiết lập mục tiêu
         n_target, a_clean = n_opts if (n_opts is not None and n_opts >= 1) else 4, a.strip().lower()
         pool, match_k = [], None
 
         # 2. Kiểm tra xem có phải dạng câu hỏi viết tắt/giải nghĩa (acronym) không
-        is_acronym_q = any(kw.lower() in q.lower() for kw in getattr(_CONFIG, 'KEYWORD_Q_INPUT', []))
+        is_acronym_q = bool(_Q_INPUT_RE and _Q_INPUT_RE.search(q_low))
         target_initials = self._get_initials(a)
+        ans_index = self._get_answer_index(all_ans)
 
         # 3. Gom pool distractors
         # Ưu tiên 1: Nếu là câu hỏi acronym (stand for, viết tắt), sinh phương án NGHIÊM NGẶT theo chữ cái đầu
         if is_acronym_q and len(target_initials) > 1:
             # Tìm các đáp án THỰC TẾ có cùng initials trong data trước
-            pool = list(set(str(x[1]).strip() for x in all_ans 
-                            if self._get_initials(str(x[1])) == target_initials and str(x[1]).strip().lower() != a_clean))
+            pool = list(set(ans for ans, ans_low in self._get_initials_index(all_ans).get(target_initials, ())
+                            if ans_low != a_clean))
             
             # Luôn cố gắng sinh thêm phương án giả để đạt độ đa dạng, sử dụng bank từ vựng và lịch sử
             bank = self._get_word_bank(all_ans)
@@ -202,34 +338,34 @@ class QuizGame:
         
         # Ưu tiên 2: Nếu KHÔNG PHẢI acronym, hoặc pool vẫn trống (không tìm thấy initials nào)
         if not pool:
-            kws = self._get_kws()
-            match_k = next((k for k in kws if k in q.lower()), None)
+            match_k = self._match_kw(q)
             
             if match_k:
-                keyword_matches = [str(x[1]).strip() for x in data 
-                                  if match_k in str(x[2]).lower() and str(x[1]).strip().lower() != a_clean]
+                keyword_matches = [ans for ans, ans_low in self._get_kw_groups(data).get(match_k, ()) if ans_low != a_clean]
                 pool = list(set(pool + keyword_matches))
 
-        # Ưu tiên 3: Fallback lấy ngẫu nhiên cho các dạng câu hỏi thông thường
-        if not is_acronym_q and len(pool) < (n_target - 1):
-            all_remaining = [str(x[1]).strip() for x in all_ans if str(x[1]).strip().lower() != a_clean]
-            pool = list(set(pool + all_remaining))
-
-        # 4. Lọc bỏ các giá trị Boolean và thực hiện "có nhiêu trả nhiêu" trong giới hạn n_target
-        pool = [o for o in pool if o not in ["Đúng", "Sai"]]
-
-        # 5. Thuật toán lọc theo độ dài (Length Similarity)
-        # Sắp xếp pool theo trị tuyệt đối độ chênh lệch chiều dài so với đáp án đúng 'a'
-        target_len = len(str(a))
-        pool.sort(key=lambda x: abs(len(str(x)) - target_len))
-
-        # Lấy một nhóm các câu có độ dài gần nhất (ví dụ top 20 câu hoặc gấp 3 số lượng cần lấy)
+        # 4 + 5. Lọc bỏ các giá trị Boolean và lọc theo độ dài (Length Similarity):
+        # chỉ giữ một nhóm các câu có độ dài gần nhất với đáp án đúng 'a' (ví dụ top 20 câu hoặc gấp 3 số lượng cần lấy)
         # để vẫn đảm bảo tính ngẫu nhiên khi sample, tránh việc 10 lần chơi đều ra 3 phương án y hệt nhau.
-        candidate_pool = pool[:max(20, (n_target - 1) * 3)]
+        target_len, k_near = len(str(a)), max(20, (n_target - 1) * 3)
+
+        # Ưu tiên 3: Fallback lấy ngẫu nhiên cho các dạng câu hỏi thông thường
+        if not is_acronym_q and not pool:
+            # Trường hợp phổ biến: lấy thẳng từ chỉ mục độ dài của cả lượt chơi, không dựng lại pool toàn bộ đáp án
+            candidate_pool = self._nearest_by_len(all_ans, target_len, a_clean, k_near)
+        else:
+            if not is_acronym_q and len(pool) < (n_target - 1):
+                all_remaining = [ans for ans, ans_low in ans_index if ans_low != a_clean]
+                pool = set(pool).union(all_remaining)
+            # nsmallest (heap O(N log K)) cho kết quả y hệt sort + cắt nhưng không phải sắp xếp cả pool.
+            candidate_pool = heapq.nsmallest(k_near, (o for o in pool if o not in {"Đúng", "Sai"}),
+                                             key=lambda x: abs(len(str(x)) - target_len))
         
-        opts = random.sample(candidate_pool, min(len(candidate_pool), n_target - 1)) + [a]
+        # Pool đã duy nhất và loại trừ đáp án đúng ở mọi nhánh -> sample không thể sinh phương án trùng
+        opts = random.sample(candidate_pool, min(len(candidate_pool), n_target - 1))
+        opts.append(a)
         random.shuffle(opts)
-        return [_replace_colors(o) for o in dict.fromkeys(opts)]
+        return [_replace_colors(o) for o in opts]
 
     def _get_diff_visual(self, u_input, c_answer):
         """Tạo chuỗi màu sắc so sánh chi tiết giữa đáp án nhập và đáp án chuẩn."""
@@ -270,25 +406,27 @@ class QuizGame:
 
     def _feedback(self, ok, chosen, q, a, d, r, ratio, qid):
         log_action(f"CHOSEN:{qid}", f"{chosen} - {q} {'Đúng' if ok else 'Sai'}")
-        if ok: 
-            p = Text.from_markup("\n[bold white on green] ✨ CHÍNH XÁC! [/] ")
-            p.append(Text.from_markup(chosen))
-            console.print(p)
-        else:
-            p = Text.from_markup("\n[bold white on red] 🌪️ TIẾC QUÁ... [/] Đáp án đúng: ")
-            p.append(Text.from_markup(a, style="bold yellow"))
-            if not ok and getattr(_CONFIG, 'FUZZY_MATCHING_ENABLED', False) and ratio > 0:
-                p.append(Text.from_markup(f" [bold cyan]({ratio*100:.1f}%)[/]"))
-            console.print(p)
+        # Gom banner, so khớp chi tiết và mô tả thành một lần ghi ra terminal
+        with console:
+            if ok: 
+                p = _OK_BANNER.copy()
+                p.append(Text.from_markup(chosen))
+                console.print(p)
+            else:
+                p = _FAIL_BANNER.copy()
+                p.append(Text.from_markup(a, style="bold yellow"))
+                if not ok and getattr(_CONFIG, 'FUZZY_MATCHING_ENABLED', False) and ratio > 0:
+                    p.append(f" ({ratio*100:.1f}%)", style="bold cyan")
+                console.print(p)
             
-            # Hiển thị so khớp chi tiết khi sai (không áp dụng cho Đúng/Sai đơn giản)
-            if chosen and str(chosen).lower() not in ["đúng", "sai"]:
-                kq_sai, so_khop = self._get_diff_visual(chosen, a)
-                console.print(kq_sai)
-                console.print(so_khop)
+                # Hiển thị so khớp chi tiết khi sai (không áp dụng cho Đúng/Sai đơn giản)
+                if chosen and str(chosen).lower() not in {"đúng", "sai"}:
+                    kq_sai, so_khop = self._get_diff_visual(chosen, a)
+                    console.print(kq_sai)
+                    console.print(so_khop)
 
-        if r: console.print(f"[cyan]  📖 Mô tả thêm: \n[/]{r}")
-        console.print("") 
+            if r: console.print(f"[cyan]  📖 Mô tả thêm: \n[/]{r}")
+            console.print("") 
 
     def _export_results(self, results, score, total):
         if total <= 0:
@@ -305,45 +443,30 @@ class QuizGame:
         if len(results) < total:
             table.add_row("...", "⏩", "[dim]Các câu còn lại đã bị bỏ qua...[/]")
             
-        console.print(table)
         bar = "█"*int(30*pct//100) + "░"*(30-int(30*pct//100))
-        console.print(f"\n[green]✅ Đúng: {score:<5}[/] [red]❌ Sai: {wrong:<5}[/] [cyan]📊 {pct:.1f}% [{bar}][/]\n")
-        ts = _get_now().strftime("%Y%m%d_%H%M%S")
-        csv_p = os.path.join(_CONFIG.EXPORT_DIR, f"quiz_results_{ts}.csv")
+        # Bảng kết quả + dòng tổng kết được đẩy ra terminal trong một lần ghi
+        with console:
+            console.print(table)
+            console.print(f"\n[green]✅ Đúng: {score:<5}[/] [red]❌ Sai: {wrong:<5}[/] [cyan]📊 {pct:.1f}% [{bar}][/]\n")
+        now = _get_now() # Một mốc thời gian cho cả tên file lẫn dòng timestamp
+        csv_p = os.path.join(_CONFIG.EXPORT_DIR, f"quiz_results_{now.strftime('%Y%m%d_%H%M%S')}.csv")
         try:
-            with open(csv_p, "w", encoding="utf-8-sig", newline="") as f:
-                csv.writer(f).writerows([["timestamp", _get_now().isoformat()], ["user", getpass.getuser()], ["total", total], ["score", score], ["percent", f"{pct:.1f}"], [], ["idx", "question", "correct", "ok", "hint", "desc"]] + [[r["index"], r["question"], r["correct"], r["ok"], r["hint"], r.get("desc", "")] for r in results])
+            # Toàn bộ báo cáo nằm trong bộ đệm 1 MiB -> được ghi xuống đĩa khi đóng file
+            with open(csv_p, "w", encoding="utf-8-sig", newline="", buffering=1 << 20) as f:
+                csv.writer(f).writerows([["timestamp", now.isoformat()], ["user", _CURRENT_USER], ["total", total], ["score", score], ["percent", f"{pct:.1f}"], [], ["idx", "question", "correct", "ok", "hint", "desc"]] + [[r["index"], r["question"], r["correct"], r["ok"], r["hint"], r.get("desc", "")] for r in results])
             log_action("EXPORT_QUIZ", f"Score: {score}/{total} ({pct:.1f}%) -> {csv_p}")
             console.print(f"[bold green]💾 Đã xuất báo cáo: {csv_p}[/]")
         except Exception as e:
             console.print(f"[red]❌ Lỗi I/O khi xuất file CSV báo cáo: {e}[/]")
 
     def get_difficulty(self):
-        table = Table(title="⚡ CHỌN MỨC ĐỘ THỬ THÁCH", box=box.SIMPLE)
-        table.add_column("Key", style="bold cyan", justify="right"); table.add_column("Chế độ", style="white")
-        modes = [
-            ("1", "[green]Dễ (10 câu, 3 đáp án)[/]"),
-            ("2", "[yellow]Vừa (20 câu, 4 đáp án)[/]"),
-            ("3", "[red]Khó (50 câu, 6 đáp án)[/]"),
-            ("4", "[magenta]Hardcore (100 câu, 10 đáp án)[/]"),
-            ("5", "Sinh tồn (Sai là dừng, 4 đáp án)"),
-            ("6", "Tùy chỉnh (Tự thiết lập)")
-        ]
-        for k, v in modes: table.add_row(k, v)
-        console.print(table)
+        console.print(_DIFFICULTY_TABLE)
         ch = inp.input_difficulty_mode()
         
-        if ch == 5: return (4, 999, True) # Chế độ sinh tồn
         if ch == 6:
             opts, qs = inp.input_difficulty_custom()
             return opts, qs, False
-            
-        return {
-            1: (3, 10, False), 
-            2: (4, 20, False), 
-            3: (6, 50, False), 
-            4: (10, 100, False)
-        }.get(ch, (4, 20, False))
+        return _DIFFICULTY_PRESETS.get(ch, (4, 20, False))
 
     def run(self, data, n_opts=None, max_qs=None, survival=False):
         if not data:
@@ -356,12 +479,11 @@ class QuizGame:
             
             # Thuật toán giới hạn tần suất keyword: Ưu tiên đa dạng hóa bộ đề
             random.shuffle(data)
-            kws = self._get_kws()
             limit = getattr(_CONFIG, 'MAX_SAME_KEYWORD_PER_QUIZ', 5)
             
             pool, overflow, kw_counts = [], [], {}
             for row in data:
-                match_k = next((k for k in kws if k in str(row[2]).lower()), None)
+                match_k = self._match_kw(row[2])
                 if match_k:
                     count = kw_counts.get(match_k, 0)
                     if count < limit:
@@ -376,7 +498,7 @@ class QuizGame:
             if max_qs:
                 if len(pool) < max_qs:
                     pool.extend(overflow[:max_qs - len(pool)])
-                pool = pool[:max_qs]
+                del pool[max_qs:] # Cắt tại chỗ, không tạo bản sao
             
             random.shuffle(pool)
             results, score = [], 0
@@ -405,11 +527,12 @@ class QuizGame:
 
     def _deduplicate_data(self, data):
         unique, seen = [], set()
+        # Sử dụng cấu hình để xác định trường nào dùng để loại bỏ trùng lặp.
+        # Mặc định là ID (index 0) để đảm bảo tính duy nhất cho các câu hỏi có cùng nội dung nhưng khác đáp án.
+        # Có thể cấu hình thành 2 trong config.py để loại bỏ các câu hỏi có nội dung giống nhau.
+        col = _CONFIG.DEDUPLICATE_COLUMN_INDEX # Đọc cấu hình một lần thay vì mỗi dòng
         for row in data:
-            # Sử dụng cấu hình để xác định trường nào dùng để loại bỏ trùng lặp.
-            # Mặc định là ID (index 0) để đảm bảo tính duy nhất cho các câu hỏi có cùng nội dung nhưng khác đáp án.
-            # Có thể cấu hình thành 2 trong config.py để loại bỏ các câu hỏi có nội dung giống nhau.
-            key_value = str(row[_CONFIG.DEDUPLICATE_COLUMN_INDEX]).strip().lower()
+            key_value = str(row[col]).strip().lower()
             if key_value not in seen:
                 unique.append(row)
                 seen.add(key_value)
@@ -417,18 +540,19 @@ class QuizGame:
 
     def _ask_question(self, i, total, qid, a, q, d, r, data, n_opts, current_score):
         _clear_screen()
-        console.rule(f"[bold white on blue]QUIZ [/] [cyan]{i}/{total}[/] │ [green]Score: {current_score}[/]")
-        
         q_d, a_d, d_d, r_d = map(_replace_colors, (q, a, d or "", r or ""))
-        # Sử dụng Text.from_markup để style bold white bao phủ toàn bộ question kể cả khi có tag reset
-        console.print("\n", Text.from_markup(q_d, style="bold white"), "\n")
-        
         # Chế độ trắc nghiệm (Multiple Choice) truyền thống
         opts = self._get_options(qid, q, a, data, data, n_opts)
-        mapping = {k: v for k, v in zip(string.ascii_uppercase[:len(opts)], opts)}
-        for k, v in mapping.items():
-            # Cô lập phần (A), (B) để không bị ảnh hưởng bởi reset màu trong v
-            console.print(Text.from_markup(f"  [bold cyan]({k})[/] ").append(Text.from_markup(v)))
+        mapping = dict(zip(string.ascii_uppercase, opts))
+
+        # Gom toàn bộ khung câu hỏi vào bộ đệm của console -> một lần ghi ra terminal
+        with console:
+            console.rule(f"[bold white on blue]QUIZ [/] [cyan]{i}/{total}[/] │ [green]Score: {current_score}[/]")
+            # Sử dụng Text.from_markup để style bold white bao phủ toàn bộ question kể cả khi có tag reset
+            console.print("\n", Text.from_markup(q_d, style="bold white"), "\n")
+            for k, v in mapping.items():
+                # Cô lập phần (A), (B) để không bị ảnh hưởng bởi reset màu trong v
+                console.print(Text.assemble("  ", (f"({k})", "bold cyan"), " ").append(Text.from_markup(v)))
 
         while True:
             u = inp.input_quiz_choice(mapping, has_hint=bool(d))
@@ -11,6 +11,10 @@ class FileManager:
         self.qdir = _CONFIG.QUESTIONS_DIR
         # Cache lưu cấu trúc: { filename: (last_mtime, last_size, last_count) }
         self._count_cache = {}
+        # Đường dẫn đầy đủ lấy sẵn từ DirEntry.path ở lần quét thư mục gần nhất: { filename: path }
+        self._paths = {}
+        # mtime (ns) của thư mục ở lần quét gần nhất; thư mục không đổi thì dùng lại _paths
+        self._dir_mtime = None
         # Dễ dàng chỉnh sửa các mốc phân loại tại đây
         self.thresholds = [
             (1, "[red]🌑 Trống[/]", "red"),
@@ -40,14 +44,18 @@ class FileManager:
         except: pass
 
     def _get_full_path(self, fname):
-        return os.path.join(self.qdir, fname)
+        return self._paths.get(fname) or os.path.join(self.qdir, fname)
 
     def get_files(self):
         try:
-            files = []
-            for f in os.listdir(self.qdir):
-                if f.endswith(".csv"):
-                    files.append(f)
+            # Thêm/xoá/đổi tên file đều làm đổi mtime thư mục -> chỉ quét lại khi thư mục thay đổi
+            dir_mtime = os.stat(self.qdir).st_mtime_ns
+            if dir_mtime != self._dir_mtime:
+                # scandir trả về DirEntry kèm loại file sẵn có, không cần stat lại từng file
+                with os.scandir(self.qdir) as it:
+                    self._paths = {e.name: e.path for e in it if e.name.endswith(".csv") and e.is_file()}
+                self._dir_mtime = dir_mtime
+            files = list(self._paths)
             # Sử dụng FILE_SORT_BY cho logic sắp xếp nội bộ (chủ yếu theo tên)
             mode = getattr(_CONFIG, 'FILE_SORT_BY', 'name_asc')
             return sorted(files, reverse=(mode == "name_desc"))
@@ -68,16 +76,20 @@ class FileManager:
                 if mtime == c_mtime and size == c_size:
                     return c_count
 
-            if size == 0: return 0
+            if size == 0:
+                self._count_cache[fname] = (mtime, size, 0)
+                return 0
 
             # 3. Nếu file đổi hoặc chưa có trong cache, đếm cực nhanh bằng khối nhị phân
             with open(path, "rb") as f:
-                count = sum(buf.count(b'\n') for buf in iter(lambda: f.read(1024 * 1024), b''))
+                count, last = 0, b''
+                for buf in iter(lambda: f.read(1024 * 1024), b''):
+                    count += buf.count(b'\n')
+                    last = buf
                 
-                # Kiểm tra nếu byte cuối cùng không phải là newline thì cộng thêm 1 dòng
-                f.seek(-1, os.SEEK_END)
-                if f.read(1) != b'\n':
-                    count += 1
+            # Kiểm tra nếu byte cuối cùng không phải là newline thì cộng thêm 1 dòng (dùng lại khối cuối, không seek)
+            if not last.endswith(b'\n'):
+                count += 1
                 
             # Trừ 1 dòng header (Giả định file CSV chuẩn luôn có header và kết thúc bằng newline)
             final_count = max(0, count - 1)
@@ -90,12 +102,17 @@ class FileManager:
     def _get_disabled_list(self):
         """Lấy danh sách các bộ đề bị vô hiệu hóa từ data/disable_flashcard.csv."""
         path = os.path.join("data", "disable_flashcard.csv")
-        if not os.path.exists(path): return []
-        try:
-            with open(path, "r", encoding="utf-8-sig") as f:
-                reader = csv.DictReader(f)
-                return [row["Tên bộ đề"] for row in reader if row.get("Tên bộ đề")]
-        except: return []
+        try: st = os.stat(path)
+        except OSError: return []
+        # Menu gọi hàm này mỗi lần vẽ lại danh sách -> chỉ đọc lại file khi (mtime, size) thay đổi
+        key = (st.st_mtime_ns, st.st_size)
+        if getattr(self, '_disabled_cache', (None,))[0] != key:
+            try:
+                with open(path, "r", encoding="utf-8-sig") as f:
+                    reader = csv.DictReader(f)
+                    self._disabled_cache = (key, [row["Tên bộ đề"] for row in reader if row.get("Tên bộ đề")])
+            except: return []
+        return list(self._disabled_cache[1]) # Trả bản sao vì toggle_disable sửa trực tiếp danh sách
 
     def toggle_disable(self, fname):
         """Bật/Tắt trạng thái vô hiệu hóa của một bộ đề."""
@@ -126,7 +143,9 @@ class FileManager:
         for f in files:
             count = self.count_questions(f)
             if hide_empty and count <= 0: continue
-            files_meta.append((f, count, os.path.getmtime(self._get_full_path(f))))
+            # count_questions vừa stat file -> dùng lại mtime trong cache, khỏi stat lần hai
+            cached = self._count_cache.get(f)
+            files_meta.append((f, count, cached[0] if cached else os.path.getmtime(self._get_full_path(f))))
 
         # Logic sắp xếp dựa trên cấu hình
         mode = getattr(_CONFIG, 'FILE_DISPLAY_SORT_BY', 'count_desc')
@@ -166,15 +185,16 @@ class FileManager:
             table.add_column("Trạng thái", justify="left")
             table.add_column("Cập nhật", justify="left")
             
+            disabled_set, now = set(disabled_list), _get_now()
             for i, (f, c, mtime_ts) in enumerate(files_meta, 1):
-                if f in disabled_list:
+                if f in disabled_set:
                     status = "[red]Vô hiệu hóa[/]"
                     color = "red"
                 else:
                     status, color = self._get_status_info(c)
                 
                 mtime_dt = datetime.datetime.fromtimestamp(mtime_ts, tz=VN_TZ)
-                diff = _get_now() - mtime_dt.replace(hour=0, minute=0, second=0, microsecond=0)
+                diff = now - mtime_dt.replace(hour=0, minute=0, second=0, microsecond=0)
                 
                 # Xác định màu sắc và nội dung dựa trên độ trễ
                 if diff.days < 3:
@@ -227,6 +247,7 @@ class FileManager:
         try:
             with open(p, "w", encoding="utf-8-sig", newline="") as f:
                 csv.writer(f).writerow(["id", "answer", "question", "hint", "desc"])
+            self._dir_mtime = None # Buộc quét lại thư mục ở lần get_files kế tiếp
             log_action("CREATE", p)
             console.print(f"[green]🆕 Đã tạo thành công: {filename}[/]"); time.sleep(1)
             return p
@@ -240,6 +261,7 @@ class FileManager:
         
         try:
             _move_to_trash(path)
+            self._dir_mtime = None
             log_action("DELETE", path)
             console.print("[yellow]📂 Đã chuyển file vào thùng rác (trash/).[/]"); time.sleep(1)
         except Exception as e:
@@ -255,6 +277,7 @@ class FileManager:
             try:
                 _move_to_trash(self._get_full_path(f))
             except: pass
+        self._dir_mtime = None
         log_action("DELETE_ALL_FILES", f"Removed {len(files)} files")
         console.print("[bold yellow]♻️ Đã dọn sạch kho dữ liệu vào thùng rác![/]"); time.sleep(1)
 
@@ -286,6 +309,7 @@ class FileManager:
         new_path = self._get_full_path(new_filename)
         try:
             os.rename(path, new_path)
+            self._dir_mtime = None
             log_action("RENAME", f"{path}->{new_path}")
             console.print(f"[green]🏷️ Đã đổi tên bộ đề thành '{new_filename}' thành công.[/]"); time.sleep(1)
         except Exception as e:
@@ -1,4 +1,7 @@
-import os, csv, uuid, time
+import os, csv, uuid, time, threading
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import chain
 from src.core import _CONFIG, console
 from src.utils import _replace_colors, _safe_input, _clear_screen, _handle_error, _move_to_trash
 from src.process_log import log_action
@@ -7,63 +10,199 @@ from rich.text import Text
 from rich import box
 import src.process_input as inp
 
+# Thứ tự cột chuẩn của một bộ đề (khớp header khi save_data)
+_COLUMNS = ("id", "answer", "question", "hint", "desc")
+
+# Icon tĩnh của bảng câu hỏi: parse markup một lần thay vì ở mỗi dòng
+_ICON_Q = Text.from_markup("[bold blue]❓ [/]")
+_ICON_A = Text.from_markup("\n[bold green]✅ [/]")
+_ICON_HINT = Text.from_markup("[yellow]💡 [/]")
+_ICON_DESC = Text.from_markup("[cyan]📖 [/]")
+
+def _parse_header(first):
+    """Tách dòng header của bộ đề: bỏ BOM, nhận diện delimiter (;) hoặc (,) và trả về (delimiter, tên cột viết thường).
+    load_data và append_row cùng dùng để hai bên luôn hiểu file giống nhau."""
+    if first.startswith('\ufeff'): first = first[1:]
+    delim = ';' if ';' in first and ',' not in first else ','
+    return delim, [h.strip().lower() for h in next(csv.reader([first], delimiter=delim), ())]
+
+def _file_stamp(path):
+    """Dấu (mtime_ns, size) của file để kiểm tra cache còn mới; None nếu không stat được."""
+    try: st = os.stat(path)
+    except OSError: return None
+    return st.st_mtime_ns, st.st_size
+
+@lru_cache(maxsize=8192)
+def _cell_text(raw, suffix=""):
+    """Parse markup của một ô trong bảng câu hỏi; bảng được vẽ lại sau mỗi lần thêm/sửa/xoá
+    nên chỉ những ô mới hoặc vừa đổi mới phải parse lại (Text.append chỉ sao chép, không sửa đối tượng cache)."""
+    return Text.from_markup(_replace_colors(raw) + suffix)
+
+def _new_ids(n):
+    """Sinh n UUID4 từ một lần gọi os.urandom thay vì gọi uuid4() cho từng ID."""
+    raw = os.urandom(16 * n)
+    return [str(uuid.UUID(bytes=raw[i:i + 16], version=4)) for i in range(0, 16 * n, 16)]
+
+# Kho ID sinh sẵn theo lô cho thao tác thêm từng câu hỏi
+_id_pool = []
+
+def _new_id(batch=256):
+    """Lấy một ID từ kho, nạp lại cả lô bằng _new_ids khi kho cạn."""
+    if not _id_pool: _id_pool.extend(_new_ids(batch))
+    return _id_pool.pop()
+
 class FlashcardManager:
     def __init__(self):
-        self._data_cache = {}
+        # Cache LRU: { path: (rows, size_estimate, (mtime_ns, file_size)) }, giới hạn theo DATA_CACHE_MAX_MB
+        self._data_cache = OrderedDict()
+        self._cache_bytes = 0
+        self._cache_lock = threading.RLock() # load_many nạp song song nhiều bộ đề
 
     def clear_cache(self, path=None):
-        if path:
-            self._data_cache.pop(path, None)
-        else:
-            self._data_cache.clear()
+        with self._cache_lock:
+            if path:
+                entry = self._data_cache.pop(path, None)
+                if entry: self._cache_bytes -= entry[1]
+            else:
+                self._data_cache.clear()
+                self._cache_bytes = 0
 
-    def _sort_data(self, data):
-        """Sắp xếp danh sách câu hỏi dựa trên cấu hình QUESTION_SORT_BY."""
+    def _cache_put(self, path, rows, stamp, size=None):
+        """Lưu bộ đề vào cache, loại bỏ các bộ đề lâu không dùng khi vượt ngân sách bộ nhớ.
+        stamp: _file_stamp lấy trước khi đọc (load_data) hoặc ngay sau khi ghi (save_data/append_row).
+        size: kích thước ước lượng đã biết trước (VD: append_row cộng dồn) để khỏi duyệt lại cả bộ đề."""
+        if size is None: size = sum(len(str(c)) for r in rows for c in r)
+        limit = getattr(_CONFIG, 'DATA_CACHE_MAX_MB', 64) * 1024 * 1024
+        with self._cache_lock:
+            self.clear_cache(path)
+            self._data_cache[path] = (rows, size, stamp)
+            self._cache_bytes += size
+            while self._cache_bytes > limit and len(self._data_cache) > 1:
+                _, (_, old_size, _) = self._data_cache.popitem(last=False)
+                self._cache_bytes -= old_size
+
+    def _sort_key(self):
+        """Trả về (key, reverse) theo cấu hình QUESTION_SORT_BY."""
         mode = getattr(_CONFIG, 'QUESTION_SORT_BY', 'answer_asc')
         col_map = {'id': 0, 'answer': 1, 'question': 2, 'hint': 3, 'desc': 4}
         parts = mode.split('_')
         idx = col_map.get(parts[0], 1)
         rev = parts[1] == 'desc' if len(parts) > 1 else False
-        # Sắp xếp chính theo cột chọn, phụ theo Answer và Question để đảm bảo thứ tự ổn định
-        data.sort(key=lambda x: (str(x[idx]).lower(), str(x[1]).lower(), str(x[2]).lower()), reverse=rev)
+        # Sắp xếp chính theo cột chọn, phụ theo Answer và Question để đảm bảo thứ tự ổn định.
+        # key= đã tính khoá đúng một lần mỗi dòng; khi cột chính là Answer/Question thì bỏ cột trùng khỏi khoá
+        if idx in {1, 2}: key = lambda x: (str(x[idx]).lower(), str(x[3 - idx]).lower())
+        else: key = lambda x: (str(x[idx]).lower(), str(x[1]).lower(), str(x[2]).lower())
+        return key, rev
+
+    def _sort_data(self, data):
+        """Sắp xếp danh sách câu hỏi dựa trên cấu hình QUESTION_SORT_BY."""
+        key, rev = self._sort_key()
+        data.sort(key=key, reverse=rev)
         return data
 
+    def _insert_sorted(self, data, row):
+        """Chèn một dòng vào danh sách đã sắp xếp bằng tìm kiếm nhị phân (O(log N) lần tính khoá thay vì sắp xếp lại cả bộ đề).
+        Dòng mới đứng sau các dòng có khoá bằng nó, giống hệt kết quả của sort ổn định."""
+        key, rev = self._sort_key()
+        k, lo, hi = key(row), 0, len(data)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mk = key(data[mid])
+            if (mk < k) if rev else (k < mk): hi = mid
+            else: lo = mid + 1
+        data.insert(lo, row)
+
     def load_data(self, path, force=False):
+        # Stat một lần trước khi đọc: nếu file bị sửa trong lúc đang đọc thì dấu lưu kèm cache đã cũ -> lần sau tự nạp lại
+        stamp = _file_stamp(path)
         # Trả về từ cache nếu có và không yêu cầu load lại
-        if not force and path in self._data_cache:
-            return self._data_cache[path]
+        if not force and stamp:
+            with self._cache_lock:
+                entry = self._data_cache.get(path)
+                # Chỉ dùng cache khi file chưa bị sửa từ bên ngoài (so (mtime_ns, size) giống cache danh sách vô hiệu hoá của FileManager)
+                if entry and entry[2] == stamp:
+                    self._data_cache.move_to_end(path)
+                    return entry[0]
 
         if not os.path.exists(path):
             return []
 
         try:
             rows = []
-            with open(path, encoding="utf-8-sig") as f:
-                # Tự động nhận diện delimiter (;) hoặc (,)
-                head = f.read(2048); f.seek(0)
-                delim = ';' if ';' in head and ',' not in head else ','
-                reader = csv.DictReader(f, delimiter=delim)
+            with open(path, encoding="utf-8", buffering=1 << 20) as f:
+                # Đọc dòng header một lần (tự bỏ BOM của file lưu bằng utf-8-sig)
+                # thay cho read(2048) + seek(0) phải giải mã lại từ đầu file
+                delim, header = _parse_header(f.readline())
+                reader = csv.reader(f, delimiter=delim)
+                width = len(header)
+                # Tra vị trí cột theo tên header một lần; chỉ sắp lại khi file lưu cột khác thứ tự chuẩn
+                ix = [header.index(c) for c in _COLUMNS] if set(_COLUMNS) <= set(header) else None
+                if ix == list(range(len(_COLUMNS))): ix = None
                 for r in reader:
-                    rows.append(list(r.values()))
+                    if not r: continue # Bỏ qua dòng trống giống DictReader
+                    # Bổ sung ô trống cho dòng thiếu cột để luôn truy cập được row[:width]
+                    if len(r) < width: r += [""] * (width - len(r))
+                    rows.append([r[i] for i in ix] if ix else r)
             
             # Sắp xếp dữ liệu sau khi load để hiển thị đúng chuẩn
             self._sort_data(rows)
-            self._data_cache[path] = rows
+            self._cache_put(path, rows, stamp)
             return rows
         except (FileNotFoundError, csv.Error, PermissionError) as e:
             _handle_error(f"❌ Lỗi nghiêm trọng khi nạp file '{os.path.basename(path)}': {type(e).__name__} - {e}")
             return []
 
-    def save_data(self, path, data):
+    def load_many(self, paths):
+        """Nạp nhiều bộ đề song song (đọc file nhả GIL), gộp kết quả theo đúng thứ tự paths."""
+        paths = list(paths)
+        if len(paths) < 2: return [r for p in paths for r in self.load_data(p)]
+        from concurrent.futures import ThreadPoolExecutor # Chỉ cần khi chơi nhiều bộ đề, không nạp lúc khởi động
+        with ThreadPoolExecutor(max_workers=min(8, len(paths))) as ex:
+            return list(chain.from_iterable(ex.map(self.load_data, paths)))
+
+    def save_data(self, path, data, presorted=False):
         try:
-            # Sắp xếp dữ liệu trước khi ghi xuống file
-            self._sort_data(data)
-            with open(path, "w", encoding="utf-8-sig", newline="") as f:
+            # Sắp xếp dữ liệu trước khi ghi xuống file (bỏ qua nếu dữ liệu vẫn giữ nguyên thứ tự, VD: sau khi xoá)
+            if not presorted: self._sort_data(data)
+            # Bộ đệm 1 MiB: cả bộ đề được ghi xuống đĩa trong vài lần write khi đóng file
+            with open(path, "w", encoding="utf-8-sig", newline="", buffering=1 << 20) as f:
                 writer = csv.writer(f)
-                writer.writerow(["id", "answer", "question", "hint", "desc"])
+                writer.writerow(_COLUMNS)
                 writer.writerows(data)
             # Cập nhật cache ngay sau khi lưu để đồng bộ dữ liệu
-            self._data_cache[path] = data
+            self._cache_put(path, data, _file_stamp(path))
+        except Exception as e:
+            _handle_error(f"❌ Không thể ghi dữ liệu xuống file '{os.path.basename(path)}': {e}")
+
+    def append_row(self, path, data, row):
+        """Ghi nối một câu hỏi vào cuối file thay vì ghi lại cả bộ đề.
+        Thứ tự trong file được chuẩn hoá lại ở lần save_data đầy đủ kế tiếp (load_data luôn sắp xếp lại)."""
+        try:
+            with open(path, "rb") as f:
+                first = f.readline()
+                f.seek(max(f.seek(0, os.SEEK_END) - 1, 0))
+                tail = f.read(1)
+            delim, header = _parse_header(first.decode("utf-8"))
+            # Dòng mới được ghi theo thứ tự _COLUMNS với delimiter ',' -> chỉ ghi nối khi header trùng khớp đúng như vậy
+            # và file kết thúc bằng xuống dòng; các trường hợp khác ghi lại cả file bằng save_data
+            appendable = tail == b"\n" and delim == ',' and header == list(_COLUMNS)
+        except (OSError, UnicodeDecodeError):
+            appendable = False
+        if not appendable:
+            data.append(row)
+            return self.save_data(path, data)
+
+        # data lấy từ load_data nên luôn đã sắp xếp theo cấu hình hiện tại (đổi cấu hình sẽ xoá cache)
+        self._insert_sorted(data, row)
+        try:
+            # Giữ đúng kiểu xuống dòng của file (các bộ đề có sẵn dùng LF) để không sinh file lẫn LF/CRLF
+            with open(path, "a", encoding="utf-8", newline="") as f:
+                csv.writer(f, lineterminator="\r\n" if first.endswith(b"\r\n") else "\n").writerow(row)
+            stamp = _file_stamp(path)
+            # Cộng kích thước dòng mới vào ước lượng đang có thay vì tính lại trên toàn bộ đề
+            with self._cache_lock: entry = self._data_cache.get(path)
+            size = entry[1] + sum(len(str(c)) for c in row) if entry and entry[0] is data else None
+            self._cache_put(path, data, stamp, size)
         except Exception as e:
             _handle_error(f"❌ Không thể ghi dữ liệu xuống file '{os.path.basename(path)}': {e}")
 
@@ -86,14 +225,14 @@ class FlashcardManager:
                 elif highlight_type == 'edit': stt_style = "bold yellow"
             
             # Tách biệt icon và nội dung để lệnh reset [/] không làm hỏng style icon
-            qa = Text.from_markup("[bold blue]❓ [/]")
-            qa.append(Text.from_markup(_replace_colors(q)))
-            qa.append(Text.from_markup("\n[bold green]✅ [/]"))
-            qa.append(Text.from_markup(_replace_colors(a)))
+            qa = _ICON_Q.copy()
+            qa.append(_cell_text(q))
+            qa.append(_ICON_A)
+            qa.append(_cell_text(a))
             
             extra = Text()
-            if d: extra.append(Text.from_markup("[yellow]💡 [/]")).append(Text.from_markup(_replace_colors(d) + "\n"))
-            if r: extra.append(Text.from_markup("[cyan]📖 [/]")).append(Text.from_markup(_replace_colors(r)))
+            if d: extra.append(_ICON_HINT).append(_cell_text(d, "\n"))
+            if r: extra.append(_ICON_DESC).append(_cell_text(r))
             table.add_row(Text(str(i), style=stt_style), qa, extra)
         console.print(table)
         return data
@@ -110,9 +249,8 @@ class FlashcardManager:
 
                 data = self.load_data(path)
                 
-                last_id = str(uuid.uuid4())
-                data.append([last_id, a, q, d or "", r or ""])
-                self.save_data(path, data)
+                last_id = _new_id()
+                self.append_row(path, data, [last_id, a, q, d or "", r or ""])
                 log_action("QUES_ADD", f"File: {os.path.basename(path)} | Q: {q[:50]}...")
                 console.print("[green]✨ Đã thêm thành công! Nhập tiếp hoặc '/exit' để dừng.[/]"); time.sleep(0.5)
             except Exception as e:
@@ -133,7 +271,7 @@ class FlashcardManager:
                     if confirm == "y":
                         _move_to_trash(path) # Backup bản cũ vào trash trước khi làm trống
                         data = []
-                        self.save_data(path, data)
+                        self.save_data(path, data, presorted=True)
                         console.print("[bold yellow]♻️ Đã dọn sạch câu hỏi (Bản cũ đã được lưu vào trash/).[/]")
                         log_action("DELETE_ALL_QUESTIONS", path)
                         time.sleep(1)
@@ -141,7 +279,7 @@ class FlashcardManager:
                     continue
 
                 removed = data.pop(val)
-                self.save_data(path, data)
+                self.save_data(path, data, presorted=True)
                 log_action("QUES_DELETE", f"File: {os.path.basename(path)} | Q: {removed[2][:50]}...")
                 console.print(f"[red]🗑️ Đã xoá câu hỏi: {_replace_colors(removed[2])}[/]"); time.sleep(0.5)
             except Exception as e:
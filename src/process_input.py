@@ -58,7 +58,7 @@ def input_quiz_choice(mapping, has_hint=False):
         try:
             prompt = "👉 Đáp án (? để nhận gợi ý): " if has_hint else "👉 Đáp án: "
             u = console.input(f"\n{prompt}").strip().upper()
-            if u in ['/EXIT', 'EXIT']: return "EXIT_SIGNAL"
+            if u in {'/EXIT', 'EXIT'}: return "EXIT_SIGNAL"
             if u == '?': return "HINT_SIGNAL"
             if u in mapping: return u
             console.print("[red]❌ Sai cú pháp![/]")
@@ -1,5 +1,5 @@
-import os, logging, getpass, atexit, time, csv
-from src.core import _CONFIG, console, _get_now, _move_to_trash
+import os, logging, logging.handlers, queue, atexit, time, csv
+from src.core import _CONFIG, console, _get_now, _move_to_trash, _CURRENT_USER
 import src.process_input as inp
 
 # --- CẤU HÌNH LOGGER ---
@@ -9,6 +9,7 @@ logger.setLevel(logging.INFO)
 _today = _get_now().strftime("%Y-%m-%d")
 _temp_log_path = os.path.join(_CONFIG.LOG_DIR, f"log-{_today}-temp.log")
 _final_log_path = os.path.join(_CONFIG.LOG_DIR, f"log-{_today}.log")
+_listener = None
 
 def _merge_log_file(temp_path):
     """Gộp nội dung từ file temp vào file log chính tương ứng."""
@@ -38,6 +39,9 @@ def _recover_orphaned_logs():
 
 def _finalize_logs():
     """Dọn dẹp handler và gộp log phiên hiện tại khi thoát."""
+    if _listener:
+        _listener.stop() # Ghi nốt các record còn trong hàng đợi xuống file
+        for handler in _listener.handlers: handler.close()
     for handler in logger.handlers[:]:
         handler.close()
         logger.removeHandler(handler)
@@ -49,13 +53,16 @@ _recover_orphaned_logs()
 if not logger.handlers:
     h = logging.FileHandler(_temp_log_path, encoding="utf-8")
     h.setFormatter(logging.Formatter('%(asctime)s | %(message)s'))
-    logger.addHandler(h)
+    # UI chỉ đẩy record vào hàng đợi, việc ghi đĩa do luồng nền của QueueListener đảm nhận
+    _listener = logging.handlers.QueueListener(queue.SimpleQueue(), h)
+    logger.addHandler(logging.handlers.QueueHandler(_listener.queue))
+    _listener.start()
     atexit.register(_finalize_logs)
 
 # Hàm ghi log tiện ích
 def log_action(action, details=""):
-    user = getpass.getuser()
-    logger.info(f"{user:<12} | {action:<20} | {details}")
+    if not logger.isEnabledFor(logging.INFO): return # Bỏ qua định dạng chuỗi khi log bị tắt
+    logger.info(f"{_CURRENT_USER:<12} | {action:<20} | {details}")
 
 def log_difficulty(qid, rating):
     """Ghi nhận đánh giá độ khó của người dùng vào file CSV tập trung."""
@@ -1,5 +1,5 @@
-import os, getpass, re
-from src.core import _CONFIG, console, _clear_screen, _get_now
+import os, re
+from src.core import _CONFIG, console, _clear_screen, _get_now, _CURRENT_USER
 from src.utils import (
     _handle_error, _move_to_trash,
     _show_stats_util, _get_history_table_util, _choose_file_path_util, _play_action_util,
@@ -37,44 +37,58 @@ class MenuManager:
         return _choose_file_path_util(self.file_mgr, allow_all, show=show, context_name=context_name)
 
     def run_menu(self, title, options, show_file_list=False, show_sidebar=True, clear=True, show_questions_path=None):
+        # Bảng lựa chọn không đổi suốt vòng lặp menu -> dựng một lần, mỗi lượt chỉ in lại
+        opt_table = Table(show_header=False, box=box.ROUNDED, border_style=_CONFIG.COLOR_MENU)
+        for k, v in options.items():
+            # Xác định màu sắc: /exit hoặc 0 đỏ, lệnh bắt đầu bằng / xanh lá, còn lại (số) xanh lơ
+            style = "bold red" if k in {"/exit", "0"} else "bold green" if k.startswith("/") else "bold cyan"
+            opt_table.add_row(f"[{style}]{k}[/]", v[1])
+        menu_panel = Panel(opt_table, title=f"[bold {_CONFIG.COLOR_MENU}]🎮 MENU[/]", border_style=_CONFIG.COLOR_MENU, expand=False)
+        header_title = f"[bold white]🚀 {title} 🚀[/]\n[{_CONFIG.COLOR_INFO}]User: {_CURRENT_USER} | "
+        header_clock, header_panel = None, None
+        redraw = True
+
         while True:
-            if clear: _clear_screen()
+            if redraw:
+                # Dựng toàn bộ khung hình (xoá màn hình, header, menu, sidebar) trong bộ đệm -> một lần ghi ra terminal
+                with console:
+                    if clear: _clear_screen()
             
-            header = f"[bold white]🚀 {title} 🚀[/]\n[{_CONFIG.COLOR_INFO}]User: {getpass.getuser()} | {_get_now().strftime('%d/%m/%Y %H:%M')}[/]"
-            console.print(Panel(Align.center(header), box=box.DOUBLE, border_style=_CONFIG.COLOR_HEADER))
-            opt_table = Table(show_header=False, box=box.ROUNDED, border_style=_CONFIG.COLOR_MENU)
-            for k, v in options.items():
-                # Xác định màu sắc: /exit hoặc 0 đỏ, lệnh bắt đầu bằng / xanh lá, còn lại (số) xanh lơ
-                style = "bold red" if k in ["/exit", "0"] else "bold green" if k.startswith("/") else "bold cyan"
-                opt_table.add_row(f"[{style}]{k}[/]", v[1])
-
-            menu_panel = Panel(opt_table, title=f"[bold {_CONFIG.COLOR_MENU}]🎮 MENU[/]", border_style=_CONFIG.COLOR_MENU, expand=False)
+                    # Chỉ phần đồng hồ (theo phút) thay đổi giữa các lượt vẽ -> dựng lại banner khi phút đổi
+                    clock = _get_now().strftime('%d/%m/%Y %H:%M')
+                    if clock != header_clock:
+                        header_clock = clock
+                        header_panel = Panel(Align.center(f"{header_title}{clock}[/]"), box=box.DOUBLE, border_style=_CONFIG.COLOR_HEADER)
+                    console.print(header_panel)
             
-            # Chuẩn bị nội dung bên phải (Ưu tiên File List, sau đó tới History)
-            right_content = None
-            if show_file_list:
-                _, right_content = self.file_mgr.list_files(show=False, return_table=True)
-            elif show_sidebar and _CONFIG.SHOW_HISTORY:
-                right_content = self.get_history_table()
-
-            if show_sidebar or show_file_list:
-                left_elements = [menu_panel]
-                if show_sidebar and _CONFIG.SHOW_STATS:
-                    left_elements.append(self.show_stats())
+                    # Chuẩn bị nội dung bên phải (Ưu tiên File List, sau đó tới History)
+                    right_content = None
+                    if show_file_list:
+                        _, right_content = self.file_mgr.list_files(show=False, return_table=True)
+                    elif show_sidebar and _CONFIG.SHOW_HISTORY:
+                        right_content = self.get_history_table()
+
+                    if show_sidebar or show_file_list:
+                        left_elements = [menu_panel]
+                        if show_sidebar and _CONFIG.SHOW_STATS:
+                            left_elements.append(self.show_stats())
                 
-                left_col = Group(*left_elements)
-                if right_content:
-                    console.print(Columns([left_col, right_content], padding=(0, 4), expand=False))
-                else:
-                    console.print(left_col)
-            else:
-                console.print(menu_panel)
-
-            if show_questions_path: self.card_mgr.show_questions(show_questions_path)
+                        left_col = Group(*left_elements)
+                        if right_content:
+                            console.print(Columns([left_col, right_content], padding=(0, 4), expand=False))
+                        else:
+                            console.print(left_col)
+                    else:
+                        console.print(menu_panel)
+
+                    if show_questions_path: self.card_mgr.show_questions(show_questions_path)
             ch = inp.input_menu_choice()
-            if ch in options: options[ch][0]()
-            if ch in ["0", "exit", "/exit"]: 
+            action = options.get(ch) # Một lần tra bảng điều phối thay vì kiểm tra `in` rồi lấy lại
+            if action: action[0]()
+            if ch in {"0", "exit", "/exit"}: 
                 break
+            # Lệnh không hợp lệ không làm đổi trạng thái -> chỉ hỏi lại, không vẽ lại cả màn hình (Enter trống vẫn làm mới)
+            redraw = action is not None or not ch
 
     def play_action(self, all_files=False):
         _play_action_util(self.file_mgr, self.card_mgr, self, all_files)
@@ -190,7 +204,7 @@ class MenuManager:
                     self._update_config_persistence("ERROR_DELAY", _CONFIG.ERROR_DELAY)
             elif ch == "3":
                 val = inp.input_setting_dedup()
-                if val in ["0", "2"]:
+                if val in {"0", "2"}:
                     _CONFIG.DEDUPLICATE_COLUMN_INDEX = int(val)
                     self._update_config_persistence("DEDUPLICATE_COLUMN_INDEX", _CONFIG.DEDUPLICATE_COLUMN_INDEX)
             elif ch == "4":
@@ -230,7 +244,7 @@ class MenuManager:
                 idx = modes.index(_CONFIG.MISTAKE_SORT_BY) if _CONFIG.MISTAKE_SORT_BY in modes else 0
                 _CONFIG.MISTAKE_SORT_BY = modes[(idx + 1) % len(modes)]
                 self._update_config_persistence("MISTAKE_SORT_BY", _CONFIG.MISTAKE_SORT_BY)
-            elif ch in ["0", "q", "exit"]:
+            elif ch in {"0", "q", "exit"}:
                 break
 
     def _update_config_persistence(self, key, value):
@@ -1,4 +1,5 @@
 import os, datetime, time, csv
+from functools import lru_cache
 from rich.table import Table
 from rich.panel import Panel
 from rich.align import Align
@@ -11,10 +12,17 @@ def _replace_colors(text):
     if not text: return ""
     if isinstance(text, (tuple, list)):
         text = text[1] if len(text) > 1 else text[0]
+    return _render_markup(str(text))
+
+@lru_cache(maxsize=4096)
+def _render_markup(t):
+    """Chuyển chuỗi thô thành Rich Markup; cùng một chuỗi được render lại nhiều lần nên ghi nhớ kết quả."""
+    # Xử lý các ký tự đặc biệt (chỉ chạy chuỗi replace khi có ký tự mở đầu escape)
+    if "\\" in t or "{" in t:
+        t = t.replace("\\n", "\n").replace("\\t", "\t").replace("{BACKSLASH}", "\\")
     
-    # Xử lý các ký tự đặc biệt
-    t = str(text).replace("\\n", "\n").replace("\\t", "\t").replace("{BACKSLASH}", "\\")
-    
+    # Chuỗi thường (không có tag nào) chỉ cần bọc [white], bỏ qua kiểm tra tag và replace
+    if "[" not in t: return f"[white]{t}[/]"
     # Nếu chuỗi đã được bọc màu rồi thì không bọc thêm [white] nữa để tránh chồng chéo tag
     if t.startswith("[") and t.endswith("[/]") and "[/][" in t:
         return t
@@ -22,45 +30,50 @@ def _replace_colors(text):
 
 # --- TIỆN ÍCH LOGIC MENU ---
 
-def _show_stats_util(file_mgr):
+@lru_cache(maxsize=8)
+def _build_stats_panel(n_files, total_q, tmp_count, trash_count, q_size, clean_size, color):
+    """Dựng panel thống kê; menu vẽ lại liên tục nhưng số liệu hiếm khi đổi nên ghi nhớ theo bộ số liệu."""
     def f_size(b):
         if b >= 1048576: return f"{b/1048576:.1f} MB"
         return f"{b/1024:.1f} KB" if b >= 1024 else f"{b} B"
 
+    table = Table(box=box.ROUNDED, show_header=False, min_width=28, border_style=color) 
+    table.add_row("Bộ đề", str(n_files))
+    table.add_row("Tổng câu", f"[bold green]{total_q}[/]")
+    table.add_row("[yellow]File tạm[/]", str(tmp_count))
+    table.add_row("[red]Thùng rác[/]", str(trash_count))
+    table.add_row("Lưu trữ bộ đề", f"[bold cyan]{f_size(q_size)}[/]")
+    table.add_row("Lưu trữ nên xóa", f"[bold yellow]{f_size(clean_size)}[/]")
+    table.add_row("Lưu trữ thực tế", f"[bold magenta]{f_size(q_size + clean_size)}[/]")
+
+    return Panel(table, title=f"[bold {color}]📊 THỐNG KÊ[/]", border_style=color, expand=False)
+
+def _show_stats_util(file_mgr):
+    def f_sizes(d, prefix=""):
+        # Một lượt scandir: DirEntry.stat() được cache, không cần isfile + getsize riêng cho từng file
+        with os.scandir(d) as it:
+            return [e.stat().st_size for e in it if e.name.startswith(prefix) and e.is_file()]
+
     try:
         files = file_mgr.get_files()
         total_q, q_size, clean_size = 0, 0, 0
         for f in files:
             count = file_mgr.count_questions(f)
             total_q += count
-            full_path = os.path.join(file_mgr.qdir, f)
-            if os.path.exists(full_path): q_size += os.path.getsize(full_path)
-
-        log_fs = [f for f in os.listdir(_CONFIG.LOG_DIR) if os.path.isfile(os.path.join(_CONFIG.LOG_DIR, f))]
-        log_count = len(log_fs)
-        for f in log_fs: clean_size += os.path.getsize(os.path.join(_CONFIG.LOG_DIR, f))
-
-        hist_fs = [f for f in os.listdir(_CONFIG.EXPORT_DIR) if f.startswith("quiz_results_")]
-        hist_count = len(hist_fs)
-        for f in hist_fs: clean_size += os.path.getsize(os.path.join(_CONFIG.EXPORT_DIR, f))
-
-        trash_fs = [f for f in os.listdir(_CONFIG.TRASH_DIR) if os.path.isfile(os.path.join(_CONFIG.TRASH_DIR, f))]
-        trash_count = len(trash_fs)
-        for f in trash_fs: clean_size += os.path.getsize(os.path.join(_CONFIG.TRASH_DIR, f))
+            # count_questions vừa stat file và lưu (mtime, size, count) -> dùng lại size, khỏi stat thêm hai lần
+            cached = file_mgr._count_cache.get(f)
+            if cached: q_size += cached[1]
+
+        log_sizes = f_sizes(_CONFIG.LOG_DIR)
+        hist_sizes = f_sizes(_CONFIG.EXPORT_DIR, "quiz_results_")
+        trash_sizes = f_sizes(_CONFIG.TRASH_DIR)
+        log_count, hist_count, trash_count = len(log_sizes), len(hist_sizes), len(trash_sizes)
+        clean_size = sum(log_sizes) + sum(hist_sizes) + sum(trash_sizes)
     except: 
         total_q, q_size, clean_size, files = 0, 0, 0, []
         log_count, hist_count, trash_count = 0, 0, 0
 
-    table = Table(box=box.ROUNDED, show_header=False, min_width=28, border_style=_CONFIG.COLOR_STATS) 
-    table.add_row("Bộ đề", str(len(files)))
-    table.add_row("Tổng câu", f"[bold green]{total_q}[/]")
-    table.add_row("[yellow]File tạm[/]", str(log_count + hist_count))
-    table.add_row("[red]Thùng rác[/]", str(trash_count))
-    table.add_row("Lưu trữ bộ đề", f"[bold cyan]{f_size(q_size)}[/]")
-    table.add_row("Lưu trữ nên xóa", f"[bold yellow]{f_size(clean_size)}[/]")
-    table.add_row("Lưu trữ thực tế", f"[bold magenta]{f_size(q_size + clean_size)}[/]")
-
-    return Panel(table, title=f"[bold {_CONFIG.COLOR_STATS}]📊 THỐNG KÊ[/]", border_style=_CONFIG.COLOR_STATS, expand=False)
+    return _build_stats_panel(len(files), total_q, log_count + hist_count, trash_count, q_size, clean_size, _CONFIG.COLOR_STATS)
 
 def _get_history_table_util():
     table = Table(box=box.ROUNDED, border_style=_CONFIG.COLOR_HISTORY)
@@ -90,7 +103,7 @@ def _choose_file_path_util(file_mgr, allow_all=False, show=True, exclude_disable
         console.print("[yellow]⚠️ Thư mục hiện đang trống.[/]"); time.sleep(1); return None
     prompt = f"👉 Nhập ID bộ đề {'hoặc /all ' if allow_all else ''}(hoặc /exit): "
     validator = lambda x: ((x.isdigit() and 1 <= int(x) <= len(files)) or (allow_all and x.lower() == "/all"), 
-                          os.path.join(file_mgr.qdir, files[int(x)-1]) if x.isdigit() else x.lower())
+                          file_mgr._get_full_path(files[int(x)-1]) if x.isdigit() else x.lower())
     return _safe_input(prompt, validator)
 
 def _play_action_util(file_mgr, card_mgr, menu_mgr, all_files=False):
@@ -99,10 +112,8 @@ def _play_action_util(file_mgr, card_mgr, menu_mgr, all_files=False):
     try:
         disabled = file_mgr._get_disabled_list()
         if all_files:
-            data = []
-            for f in file_mgr.get_files():
-                if f not in disabled and file_mgr.count_questions(f) > 0:
-                    data.extend(card_mgr.load_data(os.path.join(file_mgr.qdir, f)))
+            data = card_mgr.load_many(file_mgr._get_full_path(f) for f in file_mgr.get_files()
+                                      if f not in disabled and file_mgr.count_questions(f) > 0)
             if data: game.run(data, *game.get_difficulty())
         else:
             _clear_screen()
@@ -122,7 +133,7 @@ def _check_all_integrity_util(file_mgr, card_mgr):
     
     with console.status("[bold green]Đang quét dữ liệu...[/]"):
         for f_name in files:
-            path = os.path.join(file_mgr.qdir, f_name)
+            path = file_mgr._get_full_path(f_name)
             errors = card_mgr.validate_file(path)
             table.add_row(f_name, "\n".join([f"• {e}" for e in errors]) if errors else "[green]✅ Sạch sẽ[/]")
     console.print(table)
@@ -165,9 +176,7 @@ def _manage_filter_categories_util(file_mgr, card_mgr):
                 kws = [l.strip().lower() for l in f if l.strip() and not l.startswith("#")]
         
         # Gom toàn bộ dữ liệu từ các file CSV để đếm số lượng sử dụng
-        all_data = []
-        for f_name in file_mgr.get_files():
-            all_data.extend(card_mgr.load_data(os.path.join(file_mgr.qdir, f_name)))
+        all_data = card_mgr.load_many([file_mgr._get_full_path(f_name) for f_name in file_mgr.get_files()])
         
         # Tính toán thống kê
         stats = []
@@ -195,7 +204,7 @@ def _manage_filter_categories_util(file_mgr, card_mgr):
         if action == 'a':
             new_k = inp.input_keyword()
             if new_k: kws.append(new_k.strip().lower())
-        elif action in ['e', 'd'] and stats:
+        elif action in {'e', 'd'} and stats:
             idx = inp.input_selection("🔢 Nhập STT: ", len(stats))
             if idx is not None:
                 target_kw = stats[idx]['kw']
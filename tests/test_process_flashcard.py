@@ -0,0 +1,49 @@
+import os, tempfile, unittest
+import src.utils # Nạp utils trước để tránh vòng import giữa các module src
+from src.process_flashcard import FlashcardManager
+
+
+class AppendRowTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.mgr = FlashcardManager()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _deck(self, text):
+        path = os.path.join(self.tmp.name, "deck.csv")
+        with open(path, "w", encoding="utf-8-sig", newline="") as f: f.write(text)
+        return path
+
+    def _append_and_reload(self, path, row):
+        self.mgr.append_row(path, self.mgr.load_data(path), row)
+        # Nạp lại bằng manager mới để đọc thẳng từ đĩa, không qua cache
+        return FlashcardManager().load_data(path)
+
+    def test_canonical_header_appends_in_place(self):
+        path = self._deck("id,answer,question,hint,desc\nid1,TCP,Q1?,,\n")
+        rows = self._append_and_reload(path, ["id2", "UDP", "Q2?", "", ""])
+        self.assertEqual(sorted(rows), [["id1", "TCP", "Q1?", "", ""], ["id2", "UDP", "Q2?", "", ""]])
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            self.assertEqual(f.read(), "id,answer,question,hint,desc\nid1,TCP,Q1?,,\nid2,UDP,Q2?,,\n")
+
+    def test_crlf_deck_keeps_crlf(self):
+        path = self._deck("id,answer,question,hint,desc\r\nid1,TCP,Q1?,,\r\n")
+        self._append_and_reload(path, ["id2", "UDP", "Q2?", "", ""])
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            self.assertEqual(f.read(), "id,answer,question,hint,desc\r\nid1,TCP,Q1?,,\r\nid2,UDP,Q2?,,\r\n")
+
+    def test_non_canonical_header_keeps_columns(self):
+        path = self._deck("answer,id,question,hint,desc\nTCP,id1,Q1?,,\n")
+        rows = self._append_and_reload(path, ["id2", "UDP", "Q2?", "", ""])
+        self.assertEqual(sorted(rows), [["id1", "TCP", "Q1?", "", ""], ["id2", "UDP", "Q2?", "", ""]])
+
+    def test_semicolon_deck_with_commas_in_rows(self):
+        path = self._deck("id;answer;question;hint;desc\nid1;TCP;Hello, world?;;\n")
+        rows = self._append_and_reload(path, ["id2", "UDP", "Q2?", "", ""])
+        self.assertEqual(sorted(rows), [["id1", "TCP", "Hello, world?", "", ""], ["id2", "UDP", "Q2?", "", ""]])
+
+
+if __name__ == "__main__":
+    unittest.main()